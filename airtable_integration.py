@@ -11,14 +11,31 @@ Things it does
 """
 
 import os
+import copy
+import gzip
+import time
+import atexit
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import List, Dict, Any, Optional, Set
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
+from functools import lru_cache
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import json
+import math
 import pandas as pd
 import re
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
 # Configure logging for debugging and monitoring
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +44,11 @@ logger = logging.getLogger(__name__)
 AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 AIRTABLE_TABLE_NAME = os.getenv('AIRTABLE_TABLE_NAME', 'All Providers')
+# Opt-in gzip compression of write request bodies larger than GZIP_MIN_BODY_BYTES
+AIRTABLE_GZIP_REQUESTS = os.getenv('AIRTABLE_GZIP_REQUESTS', 'false').lower() == 'true'
+GZIP_MIN_BODY_BYTES = 1024
+# How long table reads are reused within the process; 0 (the default) disables caching
+AIRTABLE_CACHE_TTL_SECONDS = float(os.getenv('AIRTABLE_CACHE_TTL_SECONDS', '0'))
 
 # Configuration for linked record fields
 # Add field names here that should be treated as linked records
@@ -35,6 +57,109 @@ LINKED_RECORD_FIELDS = {
     # Add more field names as needed
 }
 
+# Map fields to exact Airtable table format: Email, First Name, Last Name, Registrant Full Name (F), UID, NeonCRM Account ID, Circle Account ID (C), Phone, LinkedIn URL, Company, Title, Provider Type, Match Status, Match Reasons, Last Processed, Source
+AIRTABLE_FIELD_MAPPING = {
+    # Standard field mappings (Airtable names themselves are covered by AIRTABLE_FIELDS)
+    'email': 'Email',
+    'first_name': 'First Name',
+    'last_name': 'Last Name',
+    'name_full': 'Registrant Full Name (F)',
+    'uid': 'UID',
+    'uniqueID': 'UID',
+    'neon_crm_id': 'NeonCRM Account ID',
+    'circle_id': 'Circle Account ID (C)',
+    #'phone': 'Phone',
+    #'linkedin': 'LinkedIn URL',
+    #'company': 'Company',
+    #'title': 'Title',
+    'provider_type': 'Provider Type',
+    'tags': 'Tags',
+    'tpg_id': 'TPG ID',
+    'member_status': 'Member Status',
+    'join_date': 'Join Date',
+    'event_rsvps': 'Event RSVPs',
+    'event_attendance': 'Event Attendance',
+    'donate_total': 'Donate(Total)',
+    'revenue_total': 'Revenue (Total)',
+    'newsletter': 'Newsletter',
+    'program_applications': 'Program Applications',
+    'program_acceptances': 'Program Acceptances',
+    'engagement_score': 'Engagement Score',
+    'test_link': 'Test Link',
+    'uid_from_test_link': 'UID (from Test Link)',
+    'tags_from_test_link': 'Tags (from Test Link)',
+    'events': 'Events',
+    'MATCH_STATUS': 'Match Status',
+    'match_status': 'Match Status',
+    'MATCH_REASONS': 'Match Reasons',
+    'match_reasons': 'Match Reasons'
+}
+
+# Airtable field names accepted as-is (keys already in Airtable format map to themselves)
+AIRTABLE_FIELDS = frozenset(AIRTABLE_FIELD_MAPPING.values())
+
+def _build_field_ranks() -> Dict[str, int]:
+    """
+    Rank every key accepted by format_record_for_airtable in the order the mapping
+    was originally applied, where each Airtable name sits right after its first alias
+    (email < Email, uid < UID < uniqueID, MATCH_STATUS < Match Status < match_status).
+    When several keys in a record map to the same field, the highest ranked one wins.
+    """
+    ranks = {}
+    for key, airtable_field in AIRTABLE_FIELD_MAPPING.items():
+        ranks[key] = len(ranks)
+        ranks.setdefault(airtable_field, len(ranks))
+    return ranks
+
+_FIELD_RANKS = _build_field_ranks()
+
+# Airtable field name -> internal field name used by the deduplication pipeline
+AIRTABLE_TO_DATAFRAME_FIELDS = {
+    'Email': 'email',
+    'First Name': 'first_name',
+    'Last Name': 'last_name',
+    'Registrant Full Name (F)': 'name_full',
+    'UID': 'uid',
+    'NeonCRM Account ID': 'neon_crm_id',
+    'Circle Account ID (C)': 'circle_id',
+    #'Phone': 'phone',
+    #'LinkedIn URL': 'linkedin',
+    #'Company': 'company',
+    #'Title': 'title',
+    'Provider Type': 'provider_type',
+    'Tags': 'tags',
+    'TPG ID': 'tpg_id',
+    'Member Status': 'member_status',
+    'Join Date': 'join_date',
+    'Event RSVPs': 'event_rsvps',
+    'Event Attendance': 'event_attendance',
+    'Donate(Total)': 'donate_total',
+    'Revenue (Total)': 'revenue_total',
+    'Newsletter': 'newsletter',
+    'Program Applications': 'program_applications',
+    'Program Acceptances': 'program_acceptances',
+    'Engagement Score': 'engagement_score',
+    'Test Link': 'test_link',
+    'UID (from Test Link)': 'uid_from_test_link',
+    'Tags (from Test Link)': 'tags_from_test_link',
+    'Events': 'events',
+}
+
+# Number of event IDs resolved per Events table query (keeps the filterByFormula URL short)
+EVENT_LOOKUP_BATCH_SIZE = 50
+
+# Column order used when converting Airtable records for the deduplication pipeline
+_AIRTABLE_COLUMNS = tuple(AIRTABLE_TO_DATAFRAME_FIELDS)
+_DATAFRAME_COLUMNS = tuple(AIRTABLE_TO_DATAFRAME_FIELDS.values())
+
+# Airtable record IDs are 'rec' followed by 14 alphanumeric characters
+_RECORD_ID_RE = re.compile(r'^rec[A-Za-z0-9]{14}$')
+
+# Event ID -> event name ('' if not found), filled lazily since the same events are
+# linked from many provider records. Cleared at the start of each conversion run so
+# renamed or newly named events are picked up in a long-lived process.
+_EVENT_NAME_CACHE: Dict[str, str] = {}
+
 # Construct the base URL for Airtable API calls
 AIRTABLE_API_URL = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}"
 
@@ -44,6 +169,260 @@ AIRTABLE_HEADERS = {
     'Content-Type': 'application/json'
 }
 
+# Shared HTTP session so every Airtable call (reads and writes) reuses pooled keep-alive connections
+# instead of paying a fresh TCP + TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.headers.update(AIRTABLE_HEADERS)
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=8,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],  # 429s are throttled by _RATE_LIMITER instead
+        # POST is left out so a create that reached Airtable is never sent twice
+        allowed_methods=frozenset(['GET', 'PATCH', 'DELETE']),
+        respect_retry_after_header=True
+    )
+))
+atexit.register(_SESSION.close)
+
+# Airtable allows 5 requests per second per base, and asks clients to wait 30 seconds after a 429
+AIRTABLE_MAX_REQUESTS_PER_SECOND = 5.0
+AIRTABLE_RATE_LIMIT_WAIT_SECONDS = 30.0
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Batch requests kept in flight at once by the write functions
+MAX_CONCURRENT_REQUESTS = 5
+
+class _RateLimiter:
+    """
+    Thread-safe adaptive token bucket shared by every Airtable request.
+    
+    The bucket holds at most one token, so requests are spaced 1/rate apart with no
+    initial burst. The refill rate is halved whenever Airtable answers with a 429 and
+    creeps back up towards the maximum on each successful request, so concurrent
+    requests settle just under the quota instead of triggering a storm of 429s.
+    """
+    
+    def __init__(self, max_rate: float, min_rate: float = 0.5, recovery_step: float = 0.1):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.recovery_step = recovery_step
+        self.rate = max_rate
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(1.0, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def record_success(self) -> None:
+        """Additively recover the refill rate after a successful request."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+    
+    def record_throttled(self) -> None:
+        """Halve the refill rate and drain the bucket after a 429."""
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            logger.warning(f"Airtable rate limit hit - throttling to {self.rate:.2f} requests/sec")
+
+_RATE_LIMITER = _RateLimiter(AIRTABLE_MAX_REQUESTS_PER_SECOND)
+
+# (kind, table URL, ...) -> (time cached, result) for fetch_airtable_records and
+# get_airtable_table_info. Any write to a table drops its entries. Guarded by
+# _READ_CACHE_LOCK since writes invalidate it from _send_batches worker threads.
+_READ_CACHE: Dict[tuple, tuple[float, Any]] = {}
+_READ_CACHE_LOCK = threading.Lock()
+# Bumped on every invalidation; a read only populates the cache if no invalidation
+# happened while it was in flight, so it can't store data from before a write
+_READ_CACHE_GENERATION = 0
+
+def _get_cached_read(key: tuple) -> Optional[Any]:
+    """
+    Return a cached read result if caching is enabled and it hasn't expired.
+    
+    Callers get a deep copy, so changing the result can't affect later reads.
+    """
+    if AIRTABLE_CACHE_TTL_SECONDS <= 0:
+        return None
+    with _READ_CACHE_LOCK:
+        entry = _READ_CACHE.get(key)
+    if entry is None or time.monotonic() - entry[0] >= AIRTABLE_CACHE_TTL_SECONDS:
+        return None
+    return copy.deepcopy(entry[1])
+
+def _read_cache_generation() -> int:
+    """Return the current cache generation, to be taken before a read is sent."""
+    with _READ_CACHE_LOCK:
+        return _READ_CACHE_GENERATION
+
+def _set_cached_read(key: tuple, value: Any, generation: int) -> None:
+    """
+    Cache a deep copy of a read result if caching is enabled.
+    
+    The result is dropped if the cache was invalidated since `generation` was taken,
+    as the read may have raced a write.
+    """
+    if AIRTABLE_CACHE_TTL_SECONDS > 0:
+        value = copy.deepcopy(value)
+        with _READ_CACHE_LOCK:
+            if generation == _READ_CACHE_GENERATION:
+                _READ_CACHE[key] = (time.monotonic(), value)
+
+def _invalidate_cached_reads(url: Optional[str] = None) -> None:
+    """Drop cached reads for the table at the given URL, or for every table."""
+    global _READ_CACHE_GENERATION
+    with _READ_CACHE_LOCK:
+        _READ_CACHE_GENERATION += 1
+        if url is None:
+            _READ_CACHE.clear()
+        else:
+            for key in [key for key in _READ_CACHE if key[1] == url]:
+                del _READ_CACHE[key]
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """
+    Seconds to wait before retrying a 429 response.
+    
+    Honours the Retry-After header in either of its forms (delay in seconds or an
+    HTTP date), falling back to Airtable's documented 30 second wait.
+    """
+    retry_after = response.headers.get('Retry-After')
+    if not retry_after:
+        return AIRTABLE_RATE_LIMIT_WAIT_SECONDS
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return AIRTABLE_RATE_LIMIT_WAIT_SECONDS
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+def _reject_non_finite(value: Any) -> None:
+    """
+    Raise ValueError if a JSON payload holds NaN or infinity.
+    
+    orjson silently writes these as null, which would clear the field on an updated
+    record, so they're rejected just like json.dumps(allow_nan=False) does.
+    """
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("Out of range float values are not JSON compliant")
+    elif isinstance(value, dict):
+        for item in value.values():
+            _reject_non_finite(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _reject_non_finite(item)
+    elif hasattr(value, 'tolist'):
+        # NumPy scalars and arrays, which orjson serializes natively
+        _reject_non_finite(value.tolist())
+
+def _airtable_request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session, respecting Airtable's rate limit.
+    
+    Requests wait for a token from _RATE_LIMITER, and 429 responses are retried
+    after the Retry-After delay (or Airtable's documented 30 seconds). JSON bodies
+    are serialized once up front, with orjson when it's installed, and gzipped when
+    AIRTABLE_GZIP_REQUESTS is enabled.
+    
+    Args:
+        method (str): HTTP method
+        url (str): Request URL
+        **kwargs: Passed through to requests.Session.request
+    
+    Returns:
+        requests.Response: The final response, which may still be a 429 once retries run out
+    """
+    if 'json' in kwargs:
+        payload = kwargs.pop('json')
+        try:
+            if orjson is not None:
+                _reject_non_finite(payload)
+                body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                body = json.dumps(payload, allow_nan=False).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            # Raised as requests would, so callers' RequestException handlers apply
+            raise requests.exceptions.InvalidJSONError(e) from e
+        
+        if AIRTABLE_GZIP_REQUESTS and len(body) > GZIP_MIN_BODY_BYTES:
+            # Level 1 is much faster than the default with little loss in ratio
+            body = gzip.compress(body, compresslevel=1)
+            kwargs['headers'] = {**kwargs.get('headers', {}), 'Content-Encoding': 'gzip'}
+        kwargs['data'] = body
+    
+    if method != 'GET':
+        # Cached reads of this table are stale once it's written to
+        _invalidate_cached_reads(url)
+    
+    try:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            _RATE_LIMITER.acquire()
+            response = _SESSION.request(method, url, **kwargs)
+            if response.status_code != 429:
+                _RATE_LIMITER.record_success()
+                return response
+            
+            _RATE_LIMITER.record_throttled()
+            if attempt < MAX_RATE_LIMIT_RETRIES:
+                time.sleep(_retry_after_seconds(response))
+        
+        return response
+    finally:
+        if method != 'GET':
+            # Invalidate again once the write has completed, so reads that overlapped
+            # it can't cache the table as it was before the write
+            _invalidate_cached_reads(url)
+
+def _send_batches(method: str, url: str, batch_kwargs: List[Dict]) -> Iterator[requests.Response]:
+    """
+    Send independent batch requests concurrently, yielding responses as they complete.
+    
+    Up to MAX_CONCURRENT_REQUESTS batches are in flight at once so their round trips
+    overlap, while _RATE_LIMITER keeps the overall rate within Airtable's quota. The
+    first failed batch raises, and batches that haven't started yet are cancelled.
+    
+    Args:
+        method (str): HTTP method
+        url (str): Table URL
+        batch_kwargs (List[Dict]): Keyword arguments for _airtable_request, one per batch
+    
+    Yields:
+        requests.Response: Successful responses, in completion order
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        futures = [executor.submit(_airtable_request, method, url, **kwargs) for kwargs in batch_kwargs]
+        try:
+            for future in as_completed(futures):
+                response = future.result()
+                response.raise_for_status()
+                yield response
+        finally:
+            for future in futures:
+                future.cancel()
+
+@lru_cache(maxsize=1)
 def validate_airtable_config() -> bool:
     """
     Validate that all required Airtable environment variables are properly configured.
@@ -52,6 +431,9 @@ def validate_airtable_config() -> bool:
     are set before attempting any Airtable operations. It's called by most functions
     to ensure the integration is properly configured.
     
+    The configuration is read once at import, so the result is cached for the life of
+    the process; call validate_airtable_config.cache_clear() after changing it.
+    
     Returns:
         bool: True if all required variables are set, False otherwise
         
@@ -64,7 +446,56 @@ def validate_airtable_config() -> bool:
         return False
     return True
 
-def fetch_airtable_records(table_name: str = None) -> List[Dict]:
+def _decode_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, using orjson when it's installed.
+    
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body isn't valid JSON, as
+            response.json() would, so callers' RequestException handlers apply
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response) from e
+    return response.json()
+
+def _fetch_airtable_page(url: str, params: Dict) -> tuple[List[Dict], Optional[str]]:
+    """
+    Fetch and decode a single page of records.
+    
+    Returns:
+        tuple: (records on this page, offset of the next page or None on the last page)
+    """
+    response = _airtable_request('GET', url, params=params)
+    response.raise_for_status()
+    
+    data = _decode_json(response)
+    return data.get('records', []), data.get('offset')
+
+def _iter_airtable_pages(url: str, params: Dict) -> Iterator[List[Dict]]:
+    """
+    Yield pages of records from a paginated Airtable list endpoint.
+    
+    Airtable's offset cursor is only known once a page has been decoded, so pages
+    are fetched one after another.
+    
+    Args:
+        url (str): Table URL to list records from
+        params (Dict): Query parameters sent with every page request
+    
+    Yields:
+        List[Dict]: Records from each page, in order
+    """
+    records, offset = _fetch_airtable_page(url, params)
+    yield records
+    while offset:
+        records, offset = _fetch_airtable_page(url, {**params, 'offset': offset})
+        yield records
+
+def fetch_airtable_records(table_name: str = None, fields: Optional[List[str]] = None,
+                           since: Optional[datetime] = None, modified_field: Optional[str] = None) -> List[Dict]:
     """
     Fetch all records from a specified Airtable table.
     
@@ -75,52 +506,73 @@ def fetch_airtable_records(table_name: str = None) -> List[Dict]:
     Args:
         table_name (str, optional): Name of the Airtable table to fetch from.
                                    Defaults to AIRTABLE_TABLE_NAME environment variable.
+        fields (List[str], optional): Only return these Airtable fields, filtered server-side
+                                      to cut the response size. Defaults to all fields.
+        since (datetime, optional): Only return records modified after this time, for
+                                    incremental syncs. Must be timezone-aware.
+                                    Defaults to all records.
+        modified_field (str, optional): "Last modified time" field compared against `since`.
+                                        Defaults to Airtable's LAST_MODIFIED_TIME(), which
+                                        needs no field in the table.
     
     Returns:
         List[Dict]: List of Airtable records, each containing 'id' and 'fields' keys.
                    Returns empty list if configuration is invalid or API call fails.
     
+    Raises:
+        ValueError: If `since` is a naive datetime
+    
 """
+    if since is not None and since.utcoffset() is None:
+        raise ValueError("since must be a timezone-aware datetime")
+    
     if not validate_airtable_config():
         return []
     
     table = table_name or AIRTABLE_TABLE_NAME
     url = f"{AIRTABLE_API_URL}/{table}"
     
+    cache_key = ('records', url, tuple(fields) if fields else None, since, modified_field if since else None)
+    cached_records = _get_cached_read(cache_key)
+    if cached_records is not None:
+        logger.info(f"Using {len(cached_records)} cached records from Airtable table: {table}")
+        return cached_records
+    
+    generation = _read_cache_generation()
+    
     try:
         logger.info(f"Fetching records from Airtable table: {table}")
         
         all_records = []
-        offset = None
+        params = {'pageSize': 100}  # Airtable's maximum page size
+        if fields:
+            params['fields[]'] = list(fields)
+        if since:
+            modified_time = f"{{{modified_field}}}" if modified_field else "LAST_MODIFIED_TIME()"
+            since_utc = since.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+            params['filterByFormula'] = f"IS_AFTER({modified_time}, '{since_utc}')"
         
-        while True:
-            # Prepare parameters for this request
-            params = {'pageSize': 100}  # Airtable's maximum page size
-            if offset:
-                params['offset'] = offset
-            
-            response = requests.get(url, headers=AIRTABLE_HEADERS, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            records = data.get('records', [])
+        for records in _iter_airtable_pages(url, params):
             all_records.extend(records)
-            
-            logger.info(f"Fetched {len(records)} records (total so far: {len(all_records)})")
-            
-            # Check if there are more records to fetch
-            if 'offset' in data:
-                offset = data['offset']
-            else:
-                break
+            logger.debug("Fetched %s records (total so far: %s)", len(records), len(all_records))
         
         logger.info(f"Successfully fetched {len(all_records)} total records from Airtable")
+        _set_cached_read(cache_key, all_records, generation)
         return all_records
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching records from Airtable: {str(e)}")
         return []
 
+def _is_linked_record_list(value: Any) -> bool:
+    """
+    Check whether a value looks like a linked record array (a list of record IDs).
+    
+    Airtable lists are homogeneous, so only the first item is inspected. Airtable
+    record IDs start with 'rec'.
+    """
+    return type(value) is list and len(value) > 0 and type(value[0]) is str and value[0][:3] == 'rec'
+
 def format_record_for_airtable(record: Dict) -> Dict:
     """
     Format a record dictionary to match Airtable's expected API structure.
@@ -139,97 +591,25 @@ def format_record_for_airtable(record: Dict) -> Dict:
 
     """
     fields = {}
+    field_ranks = {}
     
-    # Map fields to exact Airtable table format: Email, First Name, Last Name, Registrant Full Name (F), UID, NeonCRM Account ID, Circle Account ID (C), Phone, LinkedIn URL, Company, Title, Provider Type, Match Status, Match Reasons, Last Processed, Source
-    field_mapping = {
-        # Standard field mappings
-        'email': 'Email',
-        'Email': 'Email',
-        'first_name': 'First Name',
-        'First Name': 'First Name',
-        'last_name': 'Last Name',
-        'Last Name': 'Last Name',
-        'name_full': 'Registrant Full Name (F)',
-        'Registrant Full Name (F)': 'Registrant Full Name (F)',
-        'uid': 'UID',
-        'UID': 'UID',
-        'uniqueID': 'UID',
-        'neon_crm_id': 'NeonCRM Account ID',
-        'NeonCRM Account ID': 'NeonCRM Account ID',
-        'circle_id': 'Circle Account ID (C)',
-        'Circle Account ID (C)': 'Circle Account ID (C)',
-        #'phone': 'Phone',
-        #'Phone': 'Phone',
-        #'linkedin': 'LinkedIn URL',
-        #'LinkedIn URL': 'LinkedIn URL',
-        #'company': 'Company',
-        #'Company': 'Company',
-        #'title': 'Title',
-        #'Title': 'Title',
-        'provider_type': 'Provider Type',
-        'Provider Type': 'Provider Type',
-        'tags': 'Tags',
-        'Tags': 'Tags',
-        'tpg_id': 'TPG ID',
-        'TPG ID': 'TPG ID',
-        'member_status': 'Member Status',
-        'Member Status': 'Member Status',
-        'join_date': 'Join Date',
-        'Join Date': 'Join Date',
-        'event_rsvps': 'Event RSVPs',
-        'Event RSVPs': 'Event RSVPs',
-        'event_attendance': 'Event Attendance',
-        'Event Attendance': 'Event Attendance',
-        'donate_total': 'Donate(Total)',
-        'Donate(Total)': 'Donate(Total)',
-        'revenue_total': 'Revenue (Total)',
-        'Revenue (Total)': 'Revenue (Total)',
-        'newsletter': 'Newsletter',
-        'Newsletter': 'Newsletter',
-        'program_applications': 'Program Applications',
-        'Program Applications': 'Program Applications',
-        'program_acceptances': 'Program Acceptances',
-        'Program Acceptances': 'Program Acceptances',
-        'engagement_score': 'Engagement Score',
-        'Engagement Score': 'Engagement Score',
-        'test_link': 'Test Link',
-        'Test Link': 'Test Link',
-        'uid_from_test_link': 'UID (from Test Link)',
-        'UID (from Test Link)': 'UID (from Test Link)',
-        'tags_from_test_link': 'Tags (from Test Link)',
-        'Tags (from Test Link)': 'Tags (from Test Link)',
-        'events': 'Events',
-        'Events': 'Events',
-        'MATCH_STATUS': 'Match Status',
-        'Match Status': 'Match Status',
-        'match_status': 'Match Status',
-        'MATCH_REASONS': 'Match Reasons',
-        'Match Reasons': 'Match Reasons',
-        'match_reasons': 'Match Reasons'
-    }
-    
-    # Map fields and only include non-empty values
-    for key, airtable_field in field_mapping.items():
-        if key in record and record[key]:
-            # Handle linked record arrays - preserve as arrays
-            if isinstance(record[key], list):
-                # Check if this looks like a linked record array (all items start with 'rec')
-                if all(isinstance(item, str) and item.startswith('rec') for item in record[key]):
-                    fields[airtable_field] = record[key]
-                    logger.debug(f"Preserved linked record array for field '{airtable_field}': {record[key]}")
-                else:
-                    # Regular array - convert to string format
-                    fields[airtable_field] = record[key]
-            else:
-                fields[airtable_field] = record[key]
-    
-    # Handle any fields that weren't in the mapping but might be linked records
+    # Map fields and only include non-empty values, in a single pass over the record
     for key, value in record.items():
-        if key not in field_mapping and value:
-            # Check if this looks like a linked record array
-            if isinstance(value, list) and all(isinstance(item, str) and item.startswith('rec') for item in value):
-                fields[key] = value
-                logger.debug(f"Preserved unmapped linked record field '{key}': {value}")
+        if not value:
+            continue
+        airtable_field = AIRTABLE_FIELD_MAPPING.get(key) or (key if key in AIRTABLE_FIELDS else None)
+        if airtable_field is not None:
+            # Several keys can map to one field; the highest ranked key wins regardless
+            # of the record's key order
+            rank = _FIELD_RANKS[key]
+            if rank > field_ranks.get(airtable_field, -1):
+                field_ranks[airtable_field] = rank
+                # Mapped fields keep their value as-is, including linked record arrays
+                fields[airtable_field] = value
+        elif _is_linked_record_list(value):
+            # Preserve unmapped fields that hold linked record arrays
+            fields[key] = value
+            logger.debug("Preserved unmapped linked record field '%s': %s", key, value)
     
     # Add processing metadata for tracking
    # fields['Last Processed'] = datetime.now().strftime('%Y-%m-%d')  
@@ -261,16 +641,25 @@ def get_airtable_table_info(table_name: str = None) -> Dict:
     table = table_name or AIRTABLE_TABLE_NAME
     url = f"{AIRTABLE_API_URL}/{table}"
     
+    cache_key = ('info', url)
+    cached_info = _get_cached_read(cache_key)
+    if cached_info is not None:
+        return cached_info
+    
+    generation = _read_cache_generation()
+    
     try:
-        response = requests.get(url, headers=AIRTABLE_HEADERS, params={'maxRecords': 1})
+        response = _airtable_request('GET', url, params={'maxRecords': 1})
         response.raise_for_status()
         
-        data = response.json()
-        return {
+        data = _decode_json(response)
+        table_info = {
             'table_name': table,
             'record_count': len(data.get('records', [])),
             'fields': list(data.get('records', [{}])[0].get('fields', {}).keys()) if data.get('records') else []
         }
+        _set_cached_read(cache_key, table_info, generation)
+        return dict(table_info)
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Error getting table info: {str(e)}")
@@ -291,16 +680,20 @@ def detect_linked_record_fields(records: List[Dict]) -> Set[str]:
         Set[str]: Set of field names that contain linked record arrays
     """
     linked_record_fields = set(LINKED_RECORD_FIELDS)  # Start with configured fields
+    sampled_fields = set(linked_record_fields)  # Configured fields need no sampling
     
     for record in records:
         fields = record.get('fields', {})
         for field_name, field_value in fields.items():
-            # Check if the field value is a list (linked record array)
-            if isinstance(field_value, list):
-                # Additional check: if all items in the list look like record IDs
-                # Airtable record IDs typically start with 'rec' and are alphanumeric
-                if all(isinstance(item, str) and item.startswith('rec') for item in field_value):
-                    linked_record_fields.add(field_name)
+            # Airtable fields are homogeneously typed, so the first non-empty list
+            # seen for a field decides whether it holds linked records
+            if field_name in sampled_fields or type(field_value) is not list or not field_value:
+                continue
+            sampled_fields.add(field_name)
+            
+            # Check if the field value is a linked record array (list of record IDs)
+            if _is_linked_record_list(field_value):
+                linked_record_fields.add(field_name)
     
     return linked_record_fields
 
@@ -323,6 +716,9 @@ def convert_airtable_to_dataframe_format(records: List[Dict]) -> List[Dict]:
     """
     converted_records = []
     
+    # Resolve event names afresh for each run
+    _EVENT_NAME_CACHE.clear()
+    
     # Detect which fields contain linked records
     linked_record_fields = detect_linked_record_fields(records)
     if linked_record_fields:
@@ -330,45 +726,17 @@ def convert_airtable_to_dataframe_format(records: List[Dict]) -> List[Dict]:
     
     for record in records:
         fields = record.get('fields', {})
-        converted_record = {
-            'id': record.get('id'),
-            'email': fields.get('Email', ''),
-            'first_name': fields.get('First Name', ''),
-            'last_name': fields.get('Last Name', ''),
-            'name_full': fields.get('Registrant Full Name (F)', ''),
-            'uid': fields.get('UID', ''),
-            'neon_crm_id': fields.get('NeonCRM Account ID', ''),
-            'circle_id': fields.get('Circle Account ID (C)', ''),
-            #'phone': fields.get('Phone', ''),
-            #'linkedin': fields.get('LinkedIn URL', ''),
-            #'company': fields.get('Company', ''),
-            #'title': fields.get('Title', ''),
-            'provider_type': fields.get('Provider Type', ''),
-            'tags': fields.get('Tags', ''),
-            'tpg_id': fields.get('TPG ID', ''),
-            'member_status': fields.get('Member Status', ''),
-            'join_date': fields.get('Join Date', ''),
-            'event_rsvps': fields.get('Event RSVPs', ''),
-            'event_attendance': fields.get('Event Attendance', ''),
-            'donate_total': fields.get('Donate(Total)', ''),
-            'revenue_total': fields.get('Revenue (Total)', ''),
-            'newsletter': fields.get('Newsletter', ''),
-            'program_applications': fields.get('Program Applications', ''),
-            'program_acceptances': fields.get('Program Acceptances', ''),
-            'engagement_score': fields.get('Engagement Score', ''),
-            'test_link': fields.get('Test Link', ''),
-            'uid_from_test_link': fields.get('UID (from Test Link)', ''),
-            'tags_from_test_link': fields.get('Tags (from Test Link)', ''),
-            'events': fields.get('Events', ''),
-            'source': 'airtable'
-        }
+        converted_record = {'id': record.get('id')}
+        # Fill the fixed columns with C-level map/zip instead of a per-field Python loop
+        converted_record.update(zip(_DATAFRAME_COLUMNS, map(fields.get, _AIRTABLE_COLUMNS, repeat(''))))
+        converted_record['source'] = 'airtable'
         
         # Handle linked record fields - preserve as arrays
-        for field_name, field_value in fields.items():
-            if field_name in linked_record_fields:
-                # Preserve linked record arrays as-is
-                converted_record[field_name] = field_value
-                logger.debug(f"Preserved linked record field '{field_name}': {field_value}")
+        for field_name in linked_record_fields.intersection(fields):
+            # Preserve linked record arrays as-is
+            field_value = fields[field_name]
+            converted_record[field_name] = field_value
+            logger.debug("Preserved linked record field '%s': %s", field_name, field_value)
         
         # Process checkbox fields to convert linked records to event names
         converted_record = process_checkbox_fields(converted_record)
@@ -393,6 +761,22 @@ def configure_linked_record_fields(field_names: List[str]) -> None:
     LINKED_RECORD_FIELDS.update(field_names)
     logger.info(f"Configured linked record fields: {LINKED_RECORD_FIELDS}")
 
+def invalidate_airtable_cache(table_name: str = None) -> None:
+    """
+    Drop cached table reads so the next fetch goes to Airtable.
+    
+    Reads are only cached when AIRTABLE_CACHE_TTL_SECONDS is set, and writes made
+    through this module already invalidate the table they touch. Use this after
+    changing a table some other way. Invalidating all tables or the Events table
+    also drops cached event names.
+    
+    Args:
+        table_name (str, optional): Table to invalidate. Defaults to all tables.
+    """
+    _invalidate_cached_reads(f"{AIRTABLE_API_URL}/{table_name}" if table_name else None)
+    if table_name in (None, 'Events'):
+        _EVENT_NAME_CACHE.clear()
+
 def get_linked_record_fields() -> Set[str]:
     """
     Get the current list of configured linked record fields.
@@ -406,6 +790,9 @@ def get_event_names_from_ids(event_ids: List[str]) -> List[str]:
     """
     Convert linked record IDs to event names by querying the Events table.
     
+    Resolved names (and misses) are cached per event ID until the next
+    convert_airtable_to_dataframe_format run, so each event is only fetched once per run.
+    
     Args:
         event_ids (List[str]): List of linked record IDs (e.g., ['rec123', 'rec456'])
     
@@ -418,19 +805,37 @@ def get_event_names_from_ids(event_ids: List[str]) -> List[str]:
     event_names = []
     
     try:
-        # Query the Events table for each event ID
+        # Only valid Airtable record IDs that haven't been resolved yet need a lookup
+        # (strictly validated since they're embedded in the filterByFormula query)
+        record_ids = list(dict.fromkeys(
+            event_id for event_id in event_ids
+            if _RECORD_ID_RE.match(event_id) and event_id not in _EVENT_NAME_CACHE
+        ))
+        url = f"{AIRTABLE_API_URL}/Events"
+        
+        # Query the Events table once per chunk of IDs instead of once per ID
+        for i in range(0, len(record_ids), EVENT_LOOKUP_BATCH_SIZE):
+            chunk = record_ids[i:i + EVENT_LOOKUP_BATCH_SIZE]
+            formula = "OR(" + ",".join(f"RECORD_ID()='{event_id}'" for event_id in chunk) + ")"
+            params = {'filterByFormula': formula, 'pageSize': 100, 'fields[]': 'Event Name'}
+            response = _airtable_request('GET', url, params=params)
+            
+            if response.status_code == 200:
+                names_by_id = {
+                    event_record['id']: event_record.get('fields', {}).get('Event Name', '')
+                    for event_record in _decode_json(response).get('records', [])
+                }
+                # Cache misses too so unknown IDs aren't re-queried on every record in this run
+                for event_id in chunk:
+                    _EVENT_NAME_CACHE[event_id] = names_by_id.get(event_id, '')
+            else:
+                logger.warning(f"Could not fetch events {chunk}: {response.status_code}")
+        
+        # Preserve the order of the input IDs
         for event_id in event_ids:
-            if event_id.startswith('rec'):  # Valid Airtable record ID
-                url = f"{AIRTABLE_API_URL}/Events/{event_id}"
-                response = requests.get(url, headers=AIRTABLE_HEADERS)
-                
-                if response.status_code == 200:
-                    event_data = response.json()
-                    event_name = event_data.get('fields', {}).get('Event Name', '')
-                    if event_name:
-                        event_names.append(event_name)
-                else:
-                    logger.warning(f"Could not fetch event with ID {event_id}: {response.status_code}")
+            event_name = _EVENT_NAME_CACHE.get(event_id, '')
+            if event_name:
+                event_names.append(event_name)
         
         logger.info(f"Converted {len(event_ids)} event IDs to {len(event_names)} event names")
         return event_names
@@ -443,24 +848,26 @@ def process_checkbox_fields(record: Dict) -> Dict:
     """
     Process checkbox fields and convert boolean values to event names from linked records.
     
+    The record is updated in place (callers pass freshly built records) and returned.
+    
     Args:
         record (Dict): Record with checkbox fields
     
     Returns:
         Dict: Record with processed checkbox fields
     """
-    processed_record = record.copy()
+    processed_record = record
     
     # Get the linked events from the record (these contain actual event names)
     linked_events = record.get('Events', [])  # "Events" column with linked records
-    if isinstance(linked_events, list) and all(isinstance(item, str) and item.startswith('rec') for item in linked_events):
+    if _is_linked_record_list(linked_events):
         # Convert linked record IDs to event names
         event_names = get_event_names_from_ids(linked_events)
-        logger.debug(f"Found linked events: {linked_events} → {event_names}")
+        logger.debug("Found linked events: %s → %s", linked_events, event_names)
     elif isinstance(linked_events, str) and linked_events.strip():
         # Handle string format (comma-separated)
         event_names = [name.strip() for name in linked_events.split(',') if name.strip()]
-        logger.debug(f"Found event names from string: {event_names}")
+        logger.debug("Found event names from string: %s", event_names)
     else:
         event_names = []
     
@@ -469,16 +876,16 @@ def process_checkbox_fields(record: Dict) -> Dict:
     if isinstance(event_rsvps_checkbox, bool) and event_rsvps_checkbox and event_names:
         # If checkbox is checked AND we have event names, use the event names
         processed_record['Event RSVPs'] = event_names
-        logger.debug(f"Converted boolean Event RSVPs checkbox: {event_rsvps_checkbox} → {event_names}")
+        logger.debug("Converted boolean Event RSVPs checkbox: %s → %s", event_rsvps_checkbox, event_names)
     elif isinstance(event_rsvps_checkbox, bool) and event_rsvps_checkbox and not event_names:
         # If checkbox is checked but no event names, use placeholder
         processed_record['Event RSVPs'] = ['Has RSVP\'d to Events']
-        logger.debug(f"Converted boolean Event RSVPs checkbox: {event_rsvps_checkbox} → ['Has RSVP'd to Events'] (no linked events)")
-    elif isinstance(event_rsvps_checkbox, list) and all(isinstance(item, str) and item.startswith('rec') for item in event_rsvps_checkbox):
+        logger.debug("Converted boolean Event RSVPs checkbox: %s → ['Has RSVP'd to Events'] (no linked events)", event_rsvps_checkbox)
+    elif _is_linked_record_list(event_rsvps_checkbox):
         # Handle direct linked record IDs
         event_names = get_event_names_from_ids(event_rsvps_checkbox)
         processed_record['Event RSVPs'] = event_names
-        logger.debug(f"Converted Event RSVPs linked records: {event_rsvps_checkbox} → {event_names}")
+        logger.debug("Converted Event RSVPs linked records: %s → %s", event_rsvps_checkbox, event_names)
     elif isinstance(event_rsvps_checkbox, str) and event_rsvps_checkbox.strip():
         # Handle string format (comma-separated)
         event_names = [name.strip() for name in event_rsvps_checkbox.split(',') if name.strip()]
@@ -489,16 +896,16 @@ def process_checkbox_fields(record: Dict) -> Dict:
     if isinstance(event_attendance_checkbox, bool) and event_attendance_checkbox and event_names:
         # If checkbox is checked AND we have event names, use the event names
         processed_record['Event Attendance'] = event_names
-        logger.debug(f"Converted boolean Event Attendance checkbox: {event_attendance_checkbox} → {event_names}")
+        logger.debug("Converted boolean Event Attendance checkbox: %s → %s", event_attendance_checkbox, event_names)
     elif isinstance(event_attendance_checkbox, bool) and event_attendance_checkbox and not event_names:
         # If checkbox is checked but no event names, use placeholder
         processed_record['Event Attendance'] = ['Has Attended Events']
-        logger.debug(f"Converted boolean Event Attendance checkbox: {event_attendance_checkbox} → ['Has Attended Events'] (no linked events)")
-    elif isinstance(event_attendance_checkbox, list) and all(isinstance(item, str) and item.startswith('rec') for item in event_attendance_checkbox):
+        logger.debug("Converted boolean Event Attendance checkbox: %s → ['Has Attended Events'] (no linked events)", event_attendance_checkbox)
+    elif _is_linked_record_list(event_attendance_checkbox):
         # Handle direct linked record IDs
         event_names = get_event_names_from_ids(event_attendance_checkbox)
         processed_record['Event Attendance'] = event_names
-        logger.debug(f"Converted Event Attendance linked records: {event_attendance_checkbox} → {event_names}")
+        logger.debug("Converted Event Attendance linked records: %s → %s", event_attendance_checkbox, event_names)
     elif isinstance(event_attendance_checkbox, str) and event_attendance_checkbox.strip():
         # Handle string format (comma-separated)
         event_names = [name.strip() for name in event_attendance_checkbox.split(',') if name.strip()]
@@ -525,14 +932,15 @@ def standardize_airtable_data(df: pd.DataFrame) -> pd.DataFrame:
     from app.utils.data_processor import standardize_dataframe
     
     # Create field mappings for Airtable data
+    cols = set(df.columns)
     field_mappings = {
-        'email': 'email' if 'email' in df.columns else None,
-        'first_name': 'first_name' if 'first_name' in df.columns else None,
-        'last_name': 'last_name' if 'last_name' in df.columns else None,
-        'name_full': 'name_full' if 'name_full' in df.columns else None,
-        'linkedin': 'linkedin' if 'linkedin' in df.columns else None,
-        'uniqueID': 'uid' if 'uid' in df.columns else None,
-        'phone_cols': ['phone'] if 'phone' in df.columns else []
+        'email': 'email' if 'email' in cols else None,
+        'first_name': 'first_name' if 'first_name' in cols else None,
+        'last_name': 'last_name' if 'last_name' in cols else None,
+        'name_full': 'name_full' if 'name_full' in cols else None,
+        'linkedin': 'linkedin' if 'linkedin' in cols else None,
+        'uniqueID': 'uid' if 'uid' in cols else None,
+        'phone_cols': ['phone'] if 'phone' in cols else []
     }
     
     # Use the reusable standardization function
@@ -548,11 +956,17 @@ def standardize_airtable_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def smart_update_all_providers_with_deduplication() -> Dict:
+def smart_update_all_providers_with_deduplication(existing_records: Optional[List[Dict]] = None) -> Dict:
     """
     Smart deduplication that updates existing records in "All Providers" table
     and deletes duplicate records. This preserves comments and history for primary records.
     
+    Args:
+        existing_records (List[Dict], optional): Current "All Providers" records in Airtable's
+                                                 native format, if the caller already has them.
+                                                 Skips fetching the table again. Defaults to
+                                                 fetching all records.
+    
     Returns:
         Dict: Results of the smart deduplication process
     """
@@ -562,8 +976,11 @@ def smart_update_all_providers_with_deduplication() -> Dict:
     try:
         logger.info("Starting smart deduplication in All Providers table")
         
-        # Step 1: Fetch existing records from "All Providers" table
-        existing_records = fetch_airtable_records("All Providers")
+        # Step 1: Fetch existing records from "All Providers" table unless the caller passed them in
+        if existing_records is None:
+            # All fields are fetched: the table's columns vary (Airtable rejects unknown
+            # fields[] names), and linked record fields are detected from the data
+            existing_records = fetch_airtable_records("All Providers")
         if not existing_records:
             logger.warning("No existing records found in All Providers table")
             return {'error': 'No existing records found in All Providers table'}
@@ -592,20 +1009,18 @@ def smart_update_all_providers_with_deduplication() -> Dict:
         
         final_df = merge_matched_records(df, matched_groups, merge_reasons)
         
-        # Step 5: Convert back to records format and filter out internal fields
-        final_records = final_df.to_dict('records')
+        # Step 5: Filter out internal fields and convert back to records format
+        # Debug: Show field names of the deduplicated records
+        if not final_df.empty:
+            logger.info(f"Sample deduplicated record fields: {list(final_df.columns)}")
         
-        # Debug: Show field names in first record
-        if final_records:
-            logger.info(f"Sample deduplicated record fields: {list(final_records[0].keys())}")
+        # Drop internal deduplication fields that don't exist in Airtable in one column operation
+        internal_fields = ['MATCH_STATUS', 'MATCH_REASONS', 'email_std', 'linkedin_url_std', 'uniqueID_std', 'phone_set_std', 'first_name_std', 'last_name_std']
+        filtered_df = final_df.drop(columns=internal_fields, errors='ignore')
         
-        # Filter out internal deduplication fields that don't exist in Airtable
-        internal_fields = {'MATCH_STATUS', 'MATCH_REASONS', 'email_std', 'linkedin_url_std', 'uniqueID_std', 'phone_set_std', 'first_name_std', 'last_name_std'}
-        filtered_records = []
-        
-        for record in final_records:
-            filtered_record = {k: v for k, v in record.items() if k not in internal_fields}
-            filtered_records.append(filtered_record)
+        # Turn missing values (NaN) into None so they're skipped when formatting for Airtable
+        filtered_df = filtered_df.astype(object).where(filtered_df.notna(), None)
+        filtered_records = filtered_df.to_dict('records')
         
         # Debug: Show field names in first filtered record
         if filtered_records:
@@ -665,85 +1080,85 @@ def update_existing_records_with_deduplication_results(records: List[Dict], exis
     if not validate_airtable_config():
         return False, []
     
+    if not records and not matched_groups:
+        logger.info(f"No deduplication results to apply to {table_name}")
+        return True, []
+    
     url = f"{AIRTABLE_API_URL}/{table_name}"
     
     try:
         logger.info(f"Updating existing records in {table_name} table using deduplication results")
         
-        # Track which records are being updated (primary records from deduplication)
-        updated_record_ids = set()
         records_to_delete = []
         records_to_create = []
         
         # Process deduplicated records in batches
         batch_size = 10
         success_count = 0
+        # Track which records are being updated (primary records from deduplication) and the
+        # fields to write to each. If several groups share a primary record their fields are
+        # merged, so each record is updated at most once.
+        updates_by_id = {}
         
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            batch_updates = []
+        existing_count = len(existing_records)
+        record_count = len(records)
+        
+        # Bind hot-loop lookups to locals
+        queue_deletes = records_to_delete.extend
+        updates_for = updates_by_id.setdefault
+        
+        # Each deduplicated record corresponds to the matched group at the same index.
+        # A single pass over the groups collects both the primary record updates and the
+        # duplicate records to delete.
+        for group_idx, group in enumerate(matched_groups):
+            indices = group['indices']
             
-            for record_idx, record in enumerate(batch):
-                # Calculate the actual index in the full deduplicated records list
-                actual_record_idx = i * batch_size + record_idx
-                
-                # Safety check - make sure we don't exceed the number of deduplicated records
-                if actual_record_idx >= len(records):
-                    logger.warning(f"Skipping record index {actual_record_idx} - exceeds deduplicated records count ({len(records)})")
-                    continue
-                
-                # Find the corresponding matched group to determine which existing record to update
-                if actual_record_idx < len(matched_groups):
-                    group = matched_groups[actual_record_idx]
-                    # Use the first record in the group as the primary (the one to update)
-                    original_record_index = group['indices'][0]
-                    
-                    if original_record_index < len(existing_records):
-                        # Update the primary record from this group
-                        existing_record = existing_records[original_record_index]
-                        existing_record_id = existing_record['id']
-                        
-                        formatted_record = format_record_for_airtable(record)
-                        fields = formatted_record.get('fields', {})
-                        batch_updates.append({
-                            'id': existing_record_id,
-                            'fields': fields
-                        })
-                        updated_record_ids.add(existing_record_id)
-                        logger.info(f"Updating primary record {existing_record_id} with deduplicated data")
-                    else:
-                        logger.error(f"Original record index {original_record_index} out of bounds for deduplicated record {actual_record_idx}")
-                        continue
-                else:
-                    logger.error(f"No matched group found for deduplicated record {actual_record_idx}")
-                    continue
+            # Keep the first record (primary), delete the rest
+            queue_deletes(existing_records[i]['id'] for i in indices[1:] if i < existing_count)
             
-            if batch_updates:
-                # Update records in batch
-                payload = {'records': batch_updates}
-                response = requests.patch(url, headers=AIRTABLE_HEADERS, json=payload)
-                response.raise_for_status()
+            if group_idx >= record_count:
+                continue
+            
+            # Use the first record in the group as the primary (the one to update)
+            original_record_index = indices[0]
+            
+            if original_record_index < existing_count:
+                # Update the primary record from this group
+                existing_record = existing_records[original_record_index]
+                existing_record_id = existing_record['id']
                 
-                success_count += len(batch_updates)
-                logger.info(f"Successfully updated {len(batch_updates)} records in batch")
+                updates_for(existing_record_id, {}).update(
+                    format_record_for_airtable(records[group_idx])['fields']
+                )
+                logger.info("Updating primary record %s with deduplicated data", existing_record_id)
+            else:
+                logger.error("Original record index %s out of bounds for deduplicated record %s", original_record_index, group_idx)
+                continue
+        
+        for record_idx in range(len(matched_groups), record_count):
+            logger.error("No matched group found for deduplicated record %s", record_idx)
+        
+        # Update up to 10 records per request (Airtable's batch limit), letting
+        # Airtable coerce values such as select options to the field type
+        # Records with nothing to write are skipped rather than sent as no-op updates
+        pending_updates = [{'id': record_id, 'fields': fields} for record_id, fields in updates_by_id.items() if fields]
+        if len(pending_updates) < len(updates_by_id):
+            logger.debug("Skipping %s records with no fields to update", len(updates_by_id) - len(pending_updates))
+        batch_requests = [
+            {'json': {'records': pending_updates[i:i + batch_size], 'typecast': True}}
+            for i in range(0, len(pending_updates), batch_size)
+        ]
+        
+        # Send the update batches concurrently
+        for response in _send_batches('PATCH', url, batch_requests):
+            updated_count = len(_decode_json(response).get('records', []))
+            success_count += updated_count
+            logger.info(f"Successfully updated {updated_count} records in batch")
         
         # No new records should be created - all deduplicated records should update existing records
         if records_to_create:
             logger.error(f"Unexpected: {len(records_to_create)} records were marked for creation but should not be")
         
-        # Find records to delete (only the duplicates within each group)
-        for group in matched_groups:
-            indices = group['indices']
-            if len(indices) > 1:  # Only groups with duplicates
-                # Keep the first record (primary), delete the rest
-                primary_index = indices[0]
-                duplicate_indices = indices[1:]  # All except the first
-                
-                for duplicate_index in duplicate_indices:
-                    if duplicate_index < len(existing_records):
-                        duplicate_record = existing_records[duplicate_index]
-                        records_to_delete.append(duplicate_record['id'])
-        
         logger.info(f"Successfully updated {success_count} existing records")
         logger.info(f"Found {len(records_to_delete)} records to delete")
         return True, records_to_delete
@@ -756,13 +1171,19 @@ def update_existing_records_with_deduplication_results(records: List[Dict], exis
         return False, []
 
 
-def create_new_records_batch(records: List[Dict], table_name: str = "All Providers") -> bool:
+def create_new_records_batch(records: List[Dict], table_name: str = "All Providers", merge_on: Optional[List[str]] = None) -> bool:
     """
     Create new records in Airtable table in batches.
     
+    When merge_on is given the batches are sent as upserts (PATCH with performUpsert):
+    records matching an existing record on those fields update it instead of creating
+    a duplicate, so re-running an upload is idempotent. Records should have unique
+    values for the merge fields.
+    
     Args:
         records: List of records to create
         table_name: Name of the table to create records in
+        merge_on: Airtable field names to match existing records on (e.g. ['UID'])
     
     Returns:
         bool: True if successful, False otherwise
@@ -770,33 +1191,56 @@ def create_new_records_batch(records: List[Dict], table_name: str = "All Provide
     if not validate_airtable_config():
         return False
     
+    if not records:
+        logger.info(f"No new records to create in {table_name}")
+        return True
+    
     url = f"{AIRTABLE_API_URL}/{table_name}"
     
     try:
-        logger.info(f"Creating {len(records)} new records in {table_name}")
+        if merge_on:
+            logger.info(f"Upserting {len(records)} records in {table_name} on {merge_on}")
+        else:
+            logger.info(f"Creating {len(records)} new records in {table_name}")
         
         # Process records in batches
         batch_size = 10
         success_count = 0
+        batch_requests = []
         
         for i in range(0, len(records), batch_size):
             batch = records[i:i + batch_size]
-            batch_creates = []
-            
-            for record in batch:
-                formatted_record = format_record_for_airtable(record)
-                batch_creates.append(formatted_record)
+            # Records with no fields to write are skipped
+            batch_creates = [formatted_record for formatted_record in map(format_record_for_airtable, batch) if formatted_record['fields']]
+            if len(batch_creates) < len(batch):
+                logger.debug("Skipping %s records with no fields to create", len(batch) - len(batch_creates))
             
             if batch_creates:
-                # Create records in batch
+                # Create (or upsert) records in batch
                 payload = {'records': batch_creates}
-                response = requests.post(url, headers=AIRTABLE_HEADERS, json=payload)
-                response.raise_for_status()
-                
-                success_count += len(batch_creates)
-                logger.info(f"Successfully created {len(batch_creates)} records in batch")
+                if merge_on:
+                    payload['performUpsert'] = {'fieldsToMergeOn': list(merge_on)}
+                batch_requests.append({'json': payload})
         
-        logger.info(f"Successfully created {success_count} new records")
+        # Send the create batches concurrently
+        updated_total = 0
+        for response in _send_batches('PATCH' if merge_on else 'POST', url, batch_requests):
+            data = _decode_json(response)
+            if merge_on:
+                # Upsert responses list which records were created and which were updated
+                created_count = len(data.get('createdRecords', []))
+                updated_count = len(data.get('updatedRecords', []))
+                updated_total += updated_count
+                logger.info(f"Successfully created {created_count} and updated {updated_count} records in batch")
+            else:
+                created_count = len(data.get('records', []))
+                logger.info(f"Successfully created {created_count} records in batch")
+            success_count += created_count
+        
+        if merge_on:
+            logger.info(f"Successfully created {success_count} new records and updated {updated_total} existing records")
+        else:
+            logger.info(f"Successfully created {success_count} new records")
         return True
         
     except requests.exceptions.RequestException as e:
@@ -818,25 +1262,28 @@ def delete_duplicate_records(record_ids: List[str], table_name: str = "All Provi
     if not validate_airtable_config():
         return False
     
+    if not record_ids:
+        logger.info(f"No duplicate records to delete from {table_name}")
+        return True
+    
     url = f"{AIRTABLE_API_URL}/{table_name}"
     
     try:
         logger.info(f"Deleting {len(record_ids)} duplicate records from {table_name}")
         
-        # Delete records in batches
+        # Delete records in batches of 10 (Airtable's bulk delete limit), one request per batch
         batch_size = 10
         success_count = 0
+        batch_requests = [
+            {'params': [('records[]', record_id) for record_id in record_ids[i:i + batch_size]]}
+            for i in range(0, len(record_ids), batch_size)
+        ]
         
-        for i in range(0, len(record_ids), batch_size):
-            batch_ids = record_ids[i:i + batch_size]
-            
-            for record_id in batch_ids:
-                delete_url = f"{url}/{record_id}"
-                response = requests.delete(delete_url, headers=AIRTABLE_HEADERS)
-                response.raise_for_status()
-                success_count += 1
-            
-            logger.info(f"Successfully deleted {len(batch_ids)} records in batch")
+        # Send the delete batches concurrently
+        for response in _send_batches('DELETE', url, batch_requests):
+            deleted_count = len(_decode_json(response).get('records', []))
+            success_count += deleted_count
+            logger.info(f"Successfully deleted {deleted_count} records in batch")
         
         logger.info(f"Successfully deleted {success_count} duplicate records")
         return True